@@ -0,0 +1,30 @@
+"""
+File: forecast_verification.py
+Path: ./forecast_verification.py
+Description: Forecast Verification program file.
+             Containe methods for scoring archived meteo forecasts against observations.
+"""
+
+# Imports
+
+## local imports
+
+import modules.variables as var
+import modules.verification_classes as verification
+
+# =============== methods ==============
+
+def score_forecasts():
+    """
+    Score forecasts not already in cache against observations, save cache and scores
+    (bias, mae, rmse and hit rate per API, station, forecast type, variable and lead time).
+    """
+    verification_obj = verification.Verification()
+    verification_obj.score()
+    verification_obj.save_cache()
+    verification_obj.save(var.path_verification)
+    return verification_obj
+
+# =============== main ==============
+
+score_forecasts()
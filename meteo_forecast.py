@@ -18,6 +18,40 @@ import modules.chart_classes as chart
 
 # =============== methods ==============
 
+def valid_api_id(api_id, method_name):
+    """
+    Check if API id is in source file, print an error if not.
+    
+    Parameters:
+        api_id          ID of online api to check
+                        type: str
+        method_name     method name for error message
+                        type: str
+    """
+    if api_id in [api['id'] for api in var.online_api_info]:
+        return True
+    print("Error: API id '{}' not valid '{}'".format(api_id, method_name)) 
+    return False
+
+def save_forecast_api(forecast_obj, api_id, station):
+    """
+    Move last forecast to archive and save new forecast in last forecast for a station. 
+    
+    Parameters:
+        forecast_obj    forecast object to save
+                        type: `object forecast`
+        api_id          ID of online api
+                        type: str
+        station         informations of station
+                        type: dict    
+    """
+    # files path
+    path_last_forecast_api = var.path_last_forecast+"{}/{}/{}/".format(api_id, station["zone"],station["id"])
+    path_archive_api =  var.path_archive+"{}/{}/{}/".format(api_id, station["zone"], station["id"])
+    # clean dir last forecast
+    tb.move_dir_content(path_last_forecast_api, path_archive_api)
+    forecast_obj.save(path_last_forecast_api)
+
 def load_forecast_api(api_id, station):
     """
     Load forecast from online API, move last forecast to archive and save new forecast in last forecast for a sation. 
@@ -28,21 +62,14 @@ def load_forecast_api(api_id, station):
         station     informations of station to get forecast
                     type: dict    
     """
-    if api_id in [api['id'] for api in var.online_api_info]:
-        # files path
-        path_last_forecast_api = var.path_last_forecast+"{}/{}/{}/".format(api_id, station["zone"],station["id"])
-        path_archive_api =  var.path_archive+"{}/{}/{}/".format(api_id, station["zone"], station["id"])
-        # clean dir last forecast
-        tb.move_dir_content(path_last_forecast_api, path_archive_api)
+    if valid_api_id(api_id, "load_forecast_api(api_id, station_id)"):
         # creat forecast object
         if api_id == "meteoConcept":
             forecast_obj = forecast.MeteoConcept(station["id"])
         elif api_id == "openMeteo":
             forecast_obj = forecast.OpenMeteo(station["id"])
-        forecast_obj.save(path_last_forecast_api)
+        save_forecast_api(forecast_obj, api_id, station)
         return forecast_obj
-    else:
-        print("Error: API id '{}' not valid 'load_forecast_api(api_id, station_id)'".format(api_id)) 
 
 def load_visualization(list_forecast_obj, station):
     """
@@ -92,15 +119,67 @@ def load_forecasts(station, visu):
     if visu :
         load_visualization(list_forecast_obj, station)
 
-def load_forecasts_all_stations(visu=True):
+def load_forecasts_api_batch(api_id, stations, checks=False):
+    """
+    Load forecasts from online API for several stations, post-process dataframes for all stations at once, 
+    move last forecasts to archive and save new forecasts in last forecast. 
+    
+    Parameters:
+        api_id      ID of online api to request
+                    type: str
+        stations    informations of stations to get forecast
+                    type: list<dict>
+        checks      check daily temp min/max against hourly data (openMeteo only)
+                    type: `Boolean`
+    Return:
+        list_forecast_obj       forecast objects in the stations order
+                                type: list<`object forecast`>
+    """
+    if not valid_api_id(api_id, "load_forecasts_api_batch(api_id, stations)"):
+        return
+    if api_id == "meteoConcept":
+        forecast_class = forecast.MeteoConcept
+    elif api_id == "openMeteo":
+        forecast_class = forecast.OpenMeteo
+    # creat forecast objects
+    list_forecast_obj = [forecast_class(station["id"], batch=True) for station in stations]
+    # complete dataframes for all stations
+    if api_id == "openMeteo":
+        aggregates = forecast_class.complete_dataframes_batch(list_forecast_obj, checks=checks)
+        if checks:
+            # warn for days with daily temp min/max not consistent with hourly data
+            for station_id, df in aggregates[~aggregates.temp_check.astype(bool)].groupby('station_id', sort=False):
+                print("# Warning: daily temp min/max of '{}' not consistent with hourly data for {}".format(station_id, ", ".join(df.date.dt.strftime('%Y-%m-%d'))))
+    else:
+        forecast_class.complete_dataframes_batch(list_forecast_obj)
+    for station, forecast_obj in zip(stations, list_forecast_obj):
+        save_forecast_api(forecast_obj, api_id, station)
+    return list_forecast_obj
+
+def load_forecasts_all_stations(visu=True, batch=False, checks=False):
     """
     Load and save forecast (and visualization if option is not desactivated) for all station in file source. 
     Parameters:
         visu        for creating and saving visualization for APIs comparison as default (set False to ignore this option)
                     type: `Boolean`
+        batch       post-process forecasts of all stations at once for each API (set True for many stations)
+                    type: `Boolean`
+        checks      check daily temp min/max against hourly data in batch mode
+                    type: `Boolean`
     """
-    for station in var.stations_info:
-        load_forecasts(station, visu)
+    if not batch:
+        for station in var.stations_info:
+            load_forecasts(station, visu)
+        return
+    # Load forecast for all APIs in source file and all stations
+    list_api_id = [api['id'] for api in var.online_api_info]
+    forecast_obj_by_api = [load_forecasts_api_batch(api_id, var.stations_info, checks) for api_id in list_api_id]
+    # ignore APIs not valid
+    forecast_obj_by_api = [list_obj for list_obj in forecast_obj_by_api if list_obj != None]
+    # Creat and save visualization if not desactivated
+    if visu:
+        for i, station in enumerate(var.stations_info):
+            load_visualization([list_obj[i] for list_obj in forecast_obj_by_api], station)
 
 # =============== main ==============
 
@@ -133,7 +133,7 @@ class Forecast:
             df = df.rename(columns={v:k for k, v in parameters_availables.items()})
             # add columns not availables with NaN value
             for param in parameters_not_availables.keys():
-                df[param] = np.NaN
+                df[param] = np.nan
             # converte date to dateTime
             df.date = pd.to_datetime(df.date)
             # add forecast dataframe to dataframes 
@@ -191,6 +191,9 @@ class MeteoConcept(Forecast):
     Initialisation parameters:
         station_id      Station ID to get forecast
                         type: `string`
+        batch           skip dataframes post-processing, to be done for all stations at once 
+                        with `complete_dataframes_batch` (False as default)
+                        type: `Boolean`
 
     Attributs:
         dataframes['daily']        Daily forecast Dataframe
@@ -198,6 +201,7 @@ class MeteoConcept(Forecast):
     
     Methods: 
         __create_dataframe()        Generate daily forecast dataframe. 
+        complete_dataframes_batch(list_forecast_obj)    Post-process dataframes of several stations at once.
         save(path)                  Save dataframe as csv.
         trace_temp()                Generate traces for visualization of temperature parameter
         trace_precip()              Generate traces for visualization of precipitation parameter
@@ -205,7 +209,7 @@ class MeteoConcept(Forecast):
     """
     id_api = "meteoConcept"
 
-    def __init__(self, station_id):
+    def __init__(self, station_id, batch=False):
         """
         Class initialization
         """
@@ -224,7 +228,8 @@ class MeteoConcept(Forecast):
         # # create dataframes
         # self.create_dataframe()
         Forecast.__init__(self)
-        self.__complete_dataframes()
+        if not batch:
+            self.__complete_dataframes()
 
 
     
@@ -236,7 +241,29 @@ class MeteoConcept(Forecast):
         """
         # replace negative etp to NaN value
         for df in self.dataframes.values():
-            df[df['etp'] < 0] = np.NaN
+            df[df['etp'] < 0] = np.nan
+
+    @classmethod
+    def complete_dataframes_batch(cls, list_forecast_obj):
+        """
+        Complete dataframes of several stations at once (same result as per station).
+        Negative etp of all stations are detected on one stacked array, rows are 
+        then replaced by NaN value only for dataframes with negative etp.
+
+        Parameters:
+            list_forecast_obj       list of MeteoConcept objects created with `batch=True`
+                                    type: `list<MeteoConcept>`
+        """
+        list_df = [df for obj in list_forecast_obj for df in obj.dataframes.values()]
+        if not list_df:
+            return
+        # detect negative etp for all dataframes 
+        mask = np.concatenate([df['etp'].to_numpy(dtype=float) for df in list_df]) < 0
+        list_mask = np.split(mask, np.cumsum([len(df) for df in list_df])[:-1])
+        # replace negative etp to NaN value
+        for df, df_mask in zip(list_df, list_mask):
+            if df_mask.any():
+                df[df_mask] = np.nan
 
     # ------------------ trace graph -----------------------
 
@@ -295,19 +322,23 @@ class OpenMeteo(Forecast):
     Initialisation parameters:
         station_id      Station ID to get forecast
                         type: `string`
+        batch           skip dataframes post-processing, to be done for all stations at once 
+                        with `complete_dataframes_batch` (False as default)
+                        type: `Boolean`
 
     Attributs:
         data            data formated for dataframe creation (forecast type as key, and data as value) 
                         type: dict
     
     Methods: 
+        complete_dataframes_batch(list_forecast_obj)    Post-process dataframes of several stations at once.
         trace_temp()                Generate traces for visualization of temperature parameter
         trace_precip()              Generate traces for visualization of precipitation parameter
         trace_etp()                 Generate trace for visualization of evapotranspiration parameter  
     """
     id_api = "openMeteo"
 
-    def __init__(self, station_id):
+    def __init__(self, station_id, batch=False):
         """
         Class initialization
         """
@@ -329,7 +360,8 @@ class OpenMeteo(Forecast):
         # # create dataframes
         # self.create_dataframe()
         Forecast.__init__(self)
-        self.__complete_dataframes()
+        if not batch:
+            self.__complete_dataframes()
     
     def __complete_dataframes(self):
         """
@@ -339,6 +371,101 @@ class OpenMeteo(Forecast):
         df_etp = self.dataframes['hourly'][['etp', 'date']]
         df_etp = df_etp.resample('D', on='date').sum()
         self.dataframes['daily'].etp = df_etp.etp.values
+
+    @classmethod
+    def complete_dataframes_batch(cls, list_forecast_obj, checks=False):
+        """
+        Complete dataframes of several stations at once (same result as per station).
+        Hourly data of stations starting at midnight are grouped by number of days, each group is 
+        stacked in one array (station, day, hour) and daily sums are computed in one reduce. 
+        Other stations are completed one by one. 
+
+        With checks, daily precip sums and temp min/max are also computed from hourly data, and 
+        days where daily temp_min is above the hourly min or daily temp_max is below the hourly max 
+        are flagged (`temp_check` False). Dataframes are not modified by checks.
+
+        Parameters:
+            list_forecast_obj       list of OpenMeteo objects created with `batch=True`
+                                    type: `list<OpenMeteo>`
+            checks                  also compute daily precip sums, temp min/max and temp checks from hourly data
+                                    type: `Boolean`
+        Return:
+            aggregates              daily aggregates from hourly data, one row per station and day 
+                                    (station_id, date, etp and with checks precip, temp_min, temp_max, temp_check)
+                                    in the stations order
+                                    type: `pandas Dataframe object`
+        """
+        params = ['etp', 'precip', 'temp'] if checks else ['etp']
+        list_aggregates = []
+        # group stackable stations by number of days
+        groups = {}
+        for i, obj in enumerate(list_forecast_obj):
+            if cls.__is_stackable(obj):
+                groups.setdefault(len(obj.dataframes['hourly']) // 24, []).append(i)
+            else:
+                obj.__complete_dataframes()
+                # daily aggregates of the station (one station, day)
+                df = obj.dataframes['hourly'][['date'] + params].resample('D', on='date')
+                arrays = {'etp': df.etp.sum().to_numpy()[np.newaxis]}
+                if checks:
+                    arrays['precip'] = df.precip.sum().to_numpy()[np.newaxis]
+                    arrays['temp_min'] = df.temp.min().to_numpy()[np.newaxis]
+                    arrays['temp_max'] = df.temp.max().to_numpy()[np.newaxis]
+                list_aggregates.append(cls.__aggregates_dataframe([i], [obj], arrays, checks))
+        for n_days, index in groups.items():
+            group_obj = [list_forecast_obj[i] for i in index]
+            # stack hourly data (station, day, hour)
+            hourly = {
+                param: np.stack([obj.dataframes['hourly'][param].to_numpy(dtype=float) for obj in group_obj]).reshape(len(group_obj), n_days, 24)
+                for param in params
+            }
+            # daily sums
+            arrays = {'etp': tb.daily_sum(hourly['etp'])}
+            if checks:
+                arrays['precip'] = tb.daily_sum(hourly['precip'])
+                arrays['temp_min'] = np.fmin.reduce(hourly['temp'], axis=2)
+                arrays['temp_max'] = np.fmax.reduce(hourly['temp'], axis=2)
+            # add daily etp to daily dataframes
+            for obj, etp in zip(group_obj, arrays['etp']):
+                obj.dataframes['daily'].etp = etp
+            list_aggregates.append(cls.__aggregates_dataframe(index, group_obj, arrays, checks))
+        columns = ['station_id', 'date', 'etp'] + (['precip', 'temp_min', 'temp_max', 'temp_check'] if checks else [])
+        if not list_aggregates:
+            return pd.DataFrame(columns=columns)
+        aggregates = pd.concat(list_aggregates, ignore_index=True).sort_values('order', kind='stable')
+        return aggregates[columns].reset_index(drop=True)
+
+    @staticmethod
+    def __aggregates_dataframe(index, list_forecast_obj, arrays, checks):
+        """
+        Create daily aggregates dataframe for stations from arrays (station, day), with temp checks 
+        against daily dataframes.
+        """
+        n_days = arrays['etp'].shape[1]
+        df = pd.DataFrame({
+            'order': np.repeat(index, n_days),
+            'station_id': np.repeat([obj.station_info['id'] for obj in list_forecast_obj], n_days),
+            'date': np.concatenate([obj.dataframes['daily']['date'].to_numpy() for obj in list_forecast_obj])
+        })
+        for param, array in arrays.items():
+            df[param] = array.ravel()
+        if checks:
+            daily_temp_min = np.concatenate([obj.dataframes['daily']['temp_min'].to_numpy(dtype=float) for obj in list_forecast_obj])
+            daily_temp_max = np.concatenate([obj.dataframes['daily']['temp_max'].to_numpy(dtype=float) for obj in list_forecast_obj])
+            df['temp_check'] = ~((daily_temp_min > df.temp_min.to_numpy()) | (daily_temp_max < df.temp_max.to_numpy()))
+        return df
+
+    @staticmethod
+    def __is_stackable(obj):
+        """
+        Check if hourly data of a station can be reshaped per day (continuous hours from midnight, full days).
+        """
+        dates = obj.dataframes['hourly']['date']
+        if len(dates) == 0 or len(dates) % 24 != 0 or len(obj.dataframes['daily']) != len(dates) // 24:
+            return False
+        if dates.iloc[0] != dates.iloc[0].normalize():
+            return False
+        return bool((dates.diff().iloc[1:] == pd.Timedelta(hours=1)).all())
     
     # ------------------ trace graph -----------------------
 
@@ -8,6 +8,8 @@ Date: 03/2022
 ## import ##
 import os
 import requests
+import numpy as np
+import pandas as pd
 
 # ----------------- methods ----------------------
 
@@ -22,16 +24,17 @@ def fetch_url(url):
 
 # -------------- files management -----------------
 
-def move_dir_content(path_old_dir, path_new_dir):
+def create_dir(path_dir):
     # creat dir if not exist
-    if not os.path.exists(os.path.normpath(path_old_dir)):
-        print("# Creat directory '{}' ... ".format(os.path.normpath(path_old_dir)), end="")
-        os.makedirs(os.path.normpath(path_old_dir))
-        print("Done")
-    if not os.path.exists(os.path.normpath(path_new_dir)):
-        print("# Creat directory '{}' ... ".format(os.path.normpath(path_new_dir)), end="")
-        os.makedirs(os.path.normpath(path_new_dir))
+    if not os.path.exists(os.path.normpath(path_dir)):
+        print("# Creat directory '{}' ... ".format(os.path.normpath(path_dir)), end="")
+        os.makedirs(os.path.normpath(path_dir))
         print("Done")
+
+def move_dir_content(path_old_dir, path_new_dir):
+    # creat dir if not exist
+    create_dir(path_old_dir)
+    create_dir(path_new_dir)
     # move files to archive
     all_files = os.listdir(os.path.normpath(path_old_dir))
     for f in all_files:
@@ -46,3 +49,35 @@ def move_dir_content(path_old_dir, path_new_dir):
         print("Done") 
 
 # -------- usefull methods for dataframe creation --------- #
+
+def daily_sum(array):
+    """
+    Sum hourly values per day on the last axis of an array (station, day, hour), NaN values are ignored.
+    Values are added hour by hour with compensated summation, as pandas `resample('D').sum()`, 
+    to get the same result as the per station computation with the installed pandas version: 
+    pandas >= 2.1 resets the compensation after inf values, older versions (as pandas 1.3.4 in 
+    requirements) do not and the sum becomes NaN after an inf value.
+
+    Parameters:
+        array       hourly values
+                    type: `numpy array`
+    Return:
+        sum         daily sums
+                    type: `numpy array`
+    """
+    reset_compensation = tuple(int(v) for v in pd.__version__.split('.')[:2]) >= (2, 1)
+    total = np.zeros(array.shape[:-1])
+    compensation = np.zeros(array.shape[:-1])
+    with np.errstate(invalid='ignore'):
+        for hour in range(array.shape[-1]):
+            values = array[..., hour]
+            valid = ~np.isnan(values)
+            y = values - compensation
+            t = total + y
+            new_compensation = t - total - y
+            # inf - inf = nan
+            if reset_compensation:
+                new_compensation[np.isnan(new_compensation)] = 0
+            compensation = np.where(valid, new_compensation, compensation)
+            total = np.where(valid, t, total)
+    return total
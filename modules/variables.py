@@ -55,4 +55,8 @@ path_last_forecast = path_folder_csv+"last_forecasts/"
 # archive directory
 path_archive = path_folder_csv+"archive/"
 # images directory
-path_images = path_folder_csv+"img/"
\ No newline at end of file
+path_images = path_folder_csv+"img/"
+# observations directory
+path_observations = path_folder_csv+"observations/"
+# verification directory (scores and cache)
+path_verification = path_folder_csv+"verification/"
\ No newline at end of file
@@ -0,0 +1,337 @@
+"""
+File: verification_classes.py
+Path: ./modules/verification_classes.py
+Description: Scoring of archived meteo forecasts against observations for APIs comparison
+"""
+
+# imports
+
+import os
+import re
+import numpy as np
+import pandas as pd
+
+## local imports
+
+import modules.variables as var
+import modules.toolbox as tb
+
+# ================== Verification Classes ================== #
+
+class Verification:
+    """
+    Class for forecast verification against observations.
+
+    Forecasts files saved by `Forecast.save` (archive and last forecasts) are joined with observations
+    files of stations, and scores are computed per API, station, forecast type, variable and lead time.
+    Partial aggregates of scored issues are cached, so only new issue times are processed at the next scoring.
+    An issue is cached when its last forecast date is observed, or when its last forecast date is older than
+    `observation_delay_days` (config file) before the scoring date (observations missing or stopped).
+    Forecast files of stations without observations file are not loaded until an observations file exists.
+    Daily forecasts and observations are joined on the day (dates normalized to midnight).
+
+    Initialisation parameters:
+        path_forecasts          directories of forecasts files (archive and last forecasts as default)
+                                type: `list<string>`
+        path_observations       directory of observations files (`forecast_data/observations/` as default)
+                                type: `string`
+        path_verification       directory of cache and scores files (`forecast_data/verification/` as default)
+                                type: `string`
+
+    Attributes:
+        tolerances          tolerance of forecast error for a hit, per variable, from config file 'source_files/config.json'
+                            type: dict<`string`, `float`>
+        observation_delay   delay after the last forecast date to wait for observations before caching an issue
+                            type: `pandas Timedelta object`
+        aggregates          partial aggregates (count, errors sums, hits) per group
+                            type: `pandas Dataframe object`
+        issues              forecast issues scored in aggregates (api, station, forecast type and issue time)
+                            type: `pandas Dataframe object`
+        scores              scores (bias, mae, rmse, hit_rate) per group
+                            type: `pandas Dataframe object`
+
+    Methods:
+        list_forecast_files()       List forecast files with their issue informations.
+        load_forecasts(files)       Load forecast files in one long dataframe.
+        observations_path(station, forecast_type)       Get observations file path of a station.
+        load_observations(stations) Load observations of stations in one long dataframe.
+        load_cache()                Load cached partial aggregates and scored issues.
+        save_cache()                Save partial aggregates and scored issues.
+        aggregate(pairs)            Compute partial aggregates of forecast/observation pairs.
+        merge_aggregates(aggregates_1, aggregates_2)    Sum two partial aggregates.
+        score(date_score)           Score new forecasts and compute scores from all aggregates.
+        compute_scores(aggregates)  Compute scores from partial aggregates.
+        empty_dataframe(columns)    Create an empty dataframe with typed date columns.
+        save(path)                  Save scores as csv.
+    """
+
+    # group keys of scores
+    keys = ['api', 'station', 'forecast_type', 'variable', 'lead_time']
+    # keys of a forecast issue (one forecast file)
+    issue_keys = ['api', 'station', 'forecast_type', 'issue_time']
+    # partial aggregates columns
+    aggregates_columns = ['count', 'sum_error', 'sum_abs_error', 'sum_sq_error', 'hits']
+    # forecast file name "{API_ID}_{STATION_ID}_{DATE}_{FORECAST TYPE}.csv"
+    file_name_pattern = re.compile(r"^(?P<api>[^_]+)_(?P<station>.+)_(?P<issue_time>\d{4}_\d{2}_\d{2}_\d{2})_(?P<forecast_type>[a-z]+)\.csv$")
+
+    def __init__(self, path_forecasts=None, path_observations=None, path_verification=None):
+        """
+        Class initialisation
+        """
+        self.path_forecasts = path_forecasts if path_forecasts != None else [var.path_archive, var.path_last_forecast]
+        self.path_observations = path_observations if path_observations != None else var.path_observations
+        self.path_verification = path_verification if path_verification != None else var.path_verification
+        self.tolerances = var.config_info["verification"]["hit_tolerance"]
+        self.observation_delay = pd.Timedelta(days=var.config_info["verification"]["observation_delay_days"])
+        self.load_cache()
+
+    # ---------------- Load forecasts ------------------
+
+    def list_forecast_files(self):
+        """
+        List forecast files in forecasts directories with their issue informations.
+
+        Return:
+            files       forecast files (path, api, station, forecast type and issue time)
+                        type: `pandas Dataframe object`
+        """
+        list_files = []
+        for path in self.path_forecasts:
+            for root, dirs, files in os.walk(os.path.normpath(path)):
+                for f in files:
+                    match = self.file_name_pattern.match(f)
+                    if match:
+                        list_files.append(dict(match.groupdict(), path=os.path.join(root, f)))
+        files = pd.DataFrame(list_files, columns=['path'] + self.issue_keys)
+        files.issue_time = pd.to_datetime(files.issue_time, format="%Y_%m_%d_%H")
+        # same forecast can be in last forecasts and archive
+        return files.drop_duplicates(subset=self.issue_keys).reset_index(drop=True)
+
+    def load_forecasts(self, files):
+        """
+        Load forecast files in one long dataframe (one row per forecast value).
+
+        Parameters:
+            files       forecast files from `list_forecast_files()`
+                        type: `pandas Dataframe object`
+        Return:
+            forecasts   forecast values (issue keys, date, variable and forecast value)
+                        type: `pandas Dataframe object`
+        """
+        list_df = []
+        for i, row in enumerate(files.itertuples(index=False)):
+            df = pd.read_csv(row.path, sep=',', na_values="\\N")
+            df['file'] = i
+            list_df.append(df)
+        columns = ['date', 'file'] + list(self.tolerances.keys())
+        if not list_df:
+            return self.empty_dataframe(self.issue_keys + ['date', 'variable', 'forecast'])
+        forecasts = pd.concat(list_df, ignore_index=True).reindex(columns=columns)
+        # add issue informations
+        forecasts = forecasts.join(files[self.issue_keys], on='file').drop(columns='file')
+        forecasts.date = pd.to_datetime(forecasts.date)
+        # daily forecasts joined on the day
+        daily = forecasts.forecast_type == 'daily'
+        forecasts.loc[daily, 'date'] = forecasts.loc[daily, 'date'].dt.normalize()
+        # one row per forecast value
+        forecasts = forecasts.melt(id_vars=self.issue_keys + ['date'], var_name='variable', value_name='forecast')
+        return forecasts.dropna(subset=['date', 'forecast'])
+
+    # ---------------- Load observations ------------------
+
+    def observations_path(self, station, forecast_type):
+        """
+        Get observations file path of a station for a forecast type ("{STATION_ID}_{FORECAST TYPE}.parquet" 
+        or "{STATION_ID}_{FORECAST TYPE}.csv" in observations directory), None if no file.
+
+        Parameters:
+            station             station ID
+                                type: `string`
+            forecast_type       forecast type (daily or hourly)
+                                type: `string`
+        """
+        path = os.path.normpath(self.path_observations+"{}_{}".format(station, forecast_type))
+        for extension in [".parquet", ".csv"]:
+            if os.path.isfile(path+extension):
+                return path+extension
+        return None
+
+    def load_observations(self, stations):
+        """
+        Load observations of stations in one long dataframe (one row per observation value).
+        Observations files are "{STATION_ID}_{FORECAST TYPE}.csv" or "{STATION_ID}_{FORECAST TYPE}.parquet"
+        in observations directory, with the same columns as forecast files.
+
+        Parameters:
+            stations        stations ID to load observations
+                            type: `list<string>`
+        Return:
+            observations    observations values (station, forecast type, date, variable and observation value)
+                            type: `pandas Dataframe object`
+        """
+        list_df = []
+        for station in stations:
+            for forecast_type in var.config_info["data"]["columns"]["order"].keys():
+                path = self.observations_path(station, forecast_type)
+                if path == None:
+                    continue
+                if path.endswith(".parquet"):
+                    df = pd.read_parquet(path)
+                else:
+                    df = pd.read_csv(path, sep=',', na_values="\\N")
+                df.date = pd.to_datetime(df.date)
+                # daily observations joined on the day
+                if forecast_type == 'daily':
+                    df.date = df.date.dt.normalize()
+                df['station'] = station
+                df['forecast_type'] = forecast_type
+                list_df.append(df)
+        columns = ['station', 'forecast_type', 'date'] + list(self.tolerances.keys())
+        if not list_df:
+            return self.empty_dataframe(['station', 'forecast_type', 'date', 'variable', 'observation'])
+        observations = pd.concat(list_df, ignore_index=True).reindex(columns=columns)
+        # one row per observation value
+        observations = observations.melt(id_vars=['station', 'forecast_type', 'date'], var_name='variable', value_name='observation')
+        return observations.dropna(subset=['date', 'observation'])
+
+    # ------------------ cache -----------------------
+
+    def load_cache(self):
+        """
+        Load cached partial aggregates and scored issues as attributes (empty if no cache).
+        """
+        path_aggregates = os.path.normpath(self.path_verification+"cache_aggregates.csv")
+        path_issues = os.path.normpath(self.path_verification+"cache_issues.csv")
+        if os.path.isfile(path_aggregates) and os.path.isfile(path_issues):
+            self.aggregates = pd.read_csv(path_aggregates, sep=',')
+            self.issues = pd.read_csv(path_issues, sep=',')
+            self.issues.issue_time = pd.to_datetime(self.issues.issue_time)
+        else:
+            self.aggregates = self.empty_dataframe(self.keys + self.aggregates_columns)
+            self.issues = self.empty_dataframe(self.issue_keys)
+
+    @staticmethod
+    def empty_dataframe(columns):
+        """
+        Create an empty dataframe with datetime type for date columns ('date' and 'issue_time'), 
+        to be merged with loaded dataframes.
+        """
+        return pd.DataFrame({c: pd.Series(dtype='datetime64[ns]' if c in ['date', 'issue_time'] else object) for c in columns})
+
+    def save_cache(self):
+        """
+        Save partial aggregates and scored issues in verification directory.
+        """
+        tb.create_dir(self.path_verification)
+        print("# Save verification cache ... ", end="")
+        self.aggregates.to_csv(os.path.normpath(self.path_verification+"cache_aggregates.csv"), sep=',', index=False)
+        self.issues.to_csv(os.path.normpath(self.path_verification+"cache_issues.csv"), sep=',', index=False, date_format="%Y-%m-%d %H:%M")
+        print("Done")
+
+    # ------------------ scores -----------------------
+
+    def aggregate(self, pairs):
+        """
+        Compute partial aggregates (count, errors sums, hits) per group for forecast/observation pairs.
+
+        Parameters:
+            pairs           forecast values joined with observations values
+                            type: `pandas Dataframe object`
+        Return:
+            aggregates      partial aggregates per group
+                            type: `pandas Dataframe object`
+        """
+        error = pairs.forecast - pairs.observation
+        pairs = pairs.assign(
+            count=1,
+            sum_error=error,
+            sum_abs_error=error.abs(),
+            sum_sq_error=error**2,
+            hits=(error.abs() <= pairs.variable.map(self.tolerances)).astype(int)
+        )
+        return pairs.groupby(self.keys, as_index=False)[self.aggregates_columns].sum()
+
+    def score(self, date_score=None):
+        """
+        Score forecasts issues not in cache against observations and compute scores from all aggregates.
+        Issues with all forecast dates observed, or with last forecast date older than the observation delay, 
+        are added to cache, others are scored again at the next call. Forecast files of stations without 
+        observations file are not loaded.
+
+        Parameters:
+            date_score  scoring date for the observation delay (current date as default)
+                        type: `datetime`
+        Return:
+            scores      bias, mae, rmse and hit_rate per API, station, forecast type, variable and lead time
+                        type: `pandas Dataframe object`
+        """
+        # select new forecast files
+        files = self.list_forecast_files()
+        files = files.merge(self.issues, on=self.issue_keys, how='left', indicator=True)
+        files = files[files._merge == 'left_only'].drop(columns='_merge').reset_index(drop=True)
+        # ignore files of stations without observations
+        observed = [self.observations_path(station, forecast_type) != None for station, forecast_type in zip(files.station, files.forecast_type)]
+        files = files[np.array(observed, dtype=bool)].reset_index(drop=True)
+        if files.empty:
+            print("# No new forecast files to score")
+            self.scores = self.compute_scores(self.aggregates)
+            return self.scores
+        print("# Score {} new forecast files ... ".format(len(files)), end="")
+        forecasts = self.load_forecasts(files)
+        observations = self.load_observations(files.station.unique())
+        # join forecasts with observations
+        pairs = forecasts.merge(observations, on=['station', 'forecast_type', 'date', 'variable'], how='inner')
+        # lead time in days for daily forecasts and in hours for hourly forecasts
+        daily = pairs.forecast_type == 'daily'
+        lead_days = (pairs.date.dt.normalize() - pairs.issue_time.dt.normalize()) // pd.Timedelta(days=1)
+        lead_hours = (pairs.date - pairs.issue_time) // pd.Timedelta(hours=1)
+        pairs['lead_time'] = np.where(daily, lead_days, lead_hours)
+        # dates before issue time are not forecasts
+        pairs = pairs[pairs.lead_time >= 0].reset_index(drop=True)
+        # issues complete when last forecast date is observed or older than observation delay
+        date_score = pd.Timestamp(date_score) if date_score != None else pd.Timestamp.now()
+        last_forecast = forecasts.groupby(self.issue_keys, as_index=False).date.max()
+        last_observation = observations.groupby(['station', 'forecast_type'], as_index=False).date.max()
+        issues = last_forecast.merge(last_observation, on=['station', 'forecast_type'], how='left', suffixes=('', '_observation'))
+        issues = issues[(issues.date <= issues.date_observation) | (issues.date < date_score - self.observation_delay)][self.issue_keys]
+        complete = pairs.merge(issues, on=self.issue_keys, how='left', indicator=True)._merge == 'both'
+        # add complete issues to cache
+        self.aggregates = self.merge_aggregates(self.aggregates, self.aggregate(pairs[complete.values]))
+        self.issues = pd.concat([self.issues, issues], ignore_index=True)
+        aggregates = self.merge_aggregates(self.aggregates, self.aggregate(pairs[~complete.values]))
+        print("Done")
+        self.scores = self.compute_scores(aggregates)
+        return self.scores
+
+    def compute_scores(self, aggregates):
+        """
+        Compute scores (bias, mae, rmse and hit_rate) per group from partial aggregates.
+        """
+        scores = aggregates[self.keys].copy()
+        scores['count'] = aggregates['count'].astype(int)
+        scores['bias'] = aggregates.sum_error.astype(float) / scores['count']
+        scores['mae'] = aggregates.sum_abs_error.astype(float) / scores['count']
+        scores['rmse'] = np.sqrt(aggregates.sum_sq_error.astype(float) / scores['count'])
+        scores['hit_rate'] = aggregates.hits.astype(float) / scores['count']
+        return scores
+
+    def merge_aggregates(self, aggregates_1, aggregates_2):
+        """
+        Sum two partial aggregates dataframes per group.
+        """
+        aggregates = pd.concat([aggregates_1, aggregates_2], ignore_index=True)
+        aggregates[self.aggregates_columns] = aggregates[self.aggregates_columns].astype(float)
+        return aggregates.groupby(self.keys, as_index=False)[self.aggregates_columns].sum()
+
+    def save(self, path):
+        """
+        Save scores in csv format at the specific path as "scores.csv"
+
+        Parameters:
+            path        file path to save scores csv
+                        type: `string`
+        """
+        tb.create_dir(path)
+        print("# Save file 'scores.csv' ... ", end="")
+        self.scores.to_csv(os.path.normpath(path+"scores.csv"), sep=',', na_rep="\\N", index=False)
+        print("Done")
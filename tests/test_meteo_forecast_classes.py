@@ -0,0 +1,91 @@
+"""
+File: test_meteo_forecast_classes.py
+Path: ./tests/test_meteo_forecast_classes.py
+Description: Checks of batch post-processing of forecast dataframes (run with `python -m pytest` from project root)
+"""
+
+# imports
+
+import copy
+import numpy as np
+import pandas as pd
+
+## local imports
+
+import modules.meteo_forecast_classes as forecast
+
+# ================== methods ================== #
+
+def new_open_meteo(station_id, n_days, rng):
+    """
+    Create OpenMeteo object with random dataframes (without API request).
+    """
+    obj = object.__new__(forecast.OpenMeteo)
+    obj.station_info = {'id': station_id}
+    etp = rng.random(n_days*24) * rng.choice([1e-3, 1, 1e6], n_days*24)
+    etp[rng.random(n_days*24) < 0.1] = np.nan
+    obj.dataframes = {
+        'hourly': pd.DataFrame({
+            'date': pd.date_range("2022-03-01", periods=n_days*24, freq="h"),
+            'temp': rng.normal(10, 5, n_days*24),
+            'etp': etp,
+            'precip': rng.random(n_days*24)
+        }),
+        'daily': pd.DataFrame({
+            'date': pd.date_range("2022-03-01", periods=n_days, freq="D"),
+            'temp_min': -100.0,
+            'temp_max': 100.0,
+            'etp': np.nan,
+            'precip': 0.0
+        })
+    }
+    return obj
+
+# ================== tests ================== #
+
+def test_open_meteo_batch():
+    rng = np.random.default_rng(0)
+    list_obj = [new_open_meteo("s{}".format(i), 7, rng) for i in range(3)] + [new_open_meteo("s3", 8, rng)]
+    # station not starting at midnight (per station path) with a wrong daily temp_min
+    list_obj.append(new_open_meteo("s4", 7, rng))
+    list_obj[4].dataframes['hourly'] = list_obj[4].dataframes['hourly'].iloc[1:].reset_index(drop=True)
+    list_obj[4].dataframes['daily'].loc[2, 'temp_min'] = 100.0
+    list_ref = copy.deepcopy(list_obj)
+    for obj in list_ref:
+        obj._OpenMeteo__complete_dataframes()
+    aggregates = forecast.OpenMeteo.complete_dataframes_batch(list_obj, checks=True)
+    # same result as per station
+    for obj, ref in zip(list_obj, list_ref):
+        assert np.array_equal(obj.dataframes['daily'].etp.to_numpy(), ref.dataframes['daily'].etp.to_numpy(), equal_nan=True)
+    # aggregates for all stations in order
+    assert list(aggregates.station_id.unique()) == ["s0", "s1", "s2", "s3", "s4"]
+    assert len(aggregates) == 7*4 + 8
+    hourly = list_obj[3].dataframes['hourly'].resample('D', on='date')
+    df = aggregates[aggregates.station_id == "s3"]
+    assert np.array_equal(df.precip.to_numpy(), hourly.precip.sum().to_numpy())
+    assert np.array_equal(df.temp_min.to_numpy(), hourly.temp.min().to_numpy())
+    # only the modified day is flagged
+    flagged = aggregates[~aggregates.temp_check.astype(bool)]
+    assert list(zip(flagged.station_id, flagged.date)) == [("s4", pd.Timestamp("2022-03-03"))]
+
+def test_meteo_concept_batch():
+    rng = np.random.default_rng(0)
+    list_obj = []
+    for n_days in [14, 14, 10]:
+        obj = object.__new__(forecast.MeteoConcept)
+        obj.dataframes = {'daily': pd.DataFrame({
+            'date': pd.date_range("2022-03-01 01:00", periods=n_days, freq="D"),
+            'etp': rng.normal(0.5, 1, n_days),
+            'precip': rng.random(n_days)
+        })}
+        list_obj.append(obj)
+    # station without negative etp
+    list_obj[1].dataframes['daily'].etp = list_obj[1].dataframes['daily'].etp.abs()
+    list_ref = copy.deepcopy(list_obj)
+    for obj in list_ref:
+        obj._MeteoConcept__complete_dataframes()
+    forecast.MeteoConcept.complete_dataframes_batch(list_obj)
+    # same result as per station
+    for obj, ref in zip(list_obj, list_ref):
+        pd.testing.assert_frame_equal(obj.dataframes['daily'], ref.dataframes['daily'])
+    assert list_obj[0].dataframes['daily'].date.isna().any()
@@ -0,0 +1,127 @@
+"""
+File: test_verification_classes.py
+Path: ./tests/test_verification_classes.py
+Description: Checks of forecast verification cache (run with `python -m pytest` from project root)
+"""
+
+# imports
+
+import os
+import numpy as np
+import pandas as pd
+
+## local imports
+
+import modules.verification_classes as verification
+
+# ================== methods ================== #
+
+def write_forecast(path_archive, issue_time, forecast_type, temp_min=2.0, api="openMeteo", station="Montbard", hour=0):
+    """
+    Write a forecast file as saved by `Forecast.save` (forecast dates start at `hour` of the issue day).
+    """
+    path = os.path.join(path_archive, api, "SESAM", station)
+    os.makedirs(path, exist_ok=True)
+    issue = pd.to_datetime(issue_time, format="%Y_%m_%d_%H")
+    if forecast_type == "daily":
+        df = pd.DataFrame({"date": pd.date_range(issue.normalize() + pd.Timedelta(hours=hour), periods=3, freq="D"), "temp_min": temp_min, "precip": 1.0})
+    else:
+        df = pd.DataFrame({"date": pd.date_range(issue.normalize(), periods=24, freq="h"), "temp": temp_min, "precip": 1.0})
+    df.date = df.date.map(lambda d: d.strftime('%Y-%m-%d %H:%M'))
+    df.to_csv(os.path.join(path, "{}_{}_{}_{}.csv".format(api, station, issue_time, forecast_type)), sep=',', na_rep="\\N", index=False)
+
+def write_observations(path_observations, station="Montbard"):
+    """
+    Write daily and hourly observations files from 2022-03-01 to 2022-03-03.
+    """
+    os.makedirs(path_observations, exist_ok=True)
+    daily = pd.DataFrame({"date": pd.date_range("2022-03-01", periods=3, freq="D"), "temp_min": 1.0, "precip": 1.0})
+    daily.to_csv(os.path.join(path_observations, "{}_daily.csv".format(station)), index=False)
+    hourly = pd.DataFrame({"date": pd.date_range("2022-03-01", periods=72, freq="h"), "temp": 1.0, "precip": 1.0})
+    hourly.to_csv(os.path.join(path_observations, "{}_hourly.csv".format(station)), index=False)
+
+def new_verification(tmp_path):
+    """
+    Create verification object with tmp directories.
+    """
+    return verification.Verification(
+        [str(tmp_path / "archive") + "/"],
+        str(tmp_path / "observations") + "/",
+        str(tmp_path / "verification") + "/"
+    )
+
+# ================== tests ================== #
+
+# scoring date before observation delay of test forecasts
+DATE_SCORE = "2022-03-05"
+
+def test_no_forecast_files(tmp_path):
+    scores = new_verification(tmp_path).score()
+    assert scores.empty
+
+def test_cache_rescore(tmp_path):
+    write_observations(str(tmp_path / "observations"))
+    write_forecast(str(tmp_path / "archive"), "2022_03_01_08", "daily", temp_min=2.0)
+    write_forecast(str(tmp_path / "archive"), "2022_03_01_08", "hourly", temp_min=2.0)
+    # first run
+    verif = new_verification(tmp_path)
+    scores = verif.score(DATE_SCORE)
+    verif.save_cache()
+    assert len(verif.issues) == 2
+    # hours before issue time are not scored
+    hourly = scores[scores.forecast_type == "hourly"]
+    assert hourly.lead_time.min() == 0
+    assert hourly['count'].sum() == 2 * 16
+    daily = scores[(scores.forecast_type == "daily") & (scores.variable == "temp_min")]
+    assert list(daily.lead_time) == [0, 1, 2]
+    assert np.allclose(daily.bias, 1.0)
+    # cached re-run without new forecast
+    verif = new_verification(tmp_path)
+    rescores = verif.score(DATE_SCORE)
+    verif.save_cache()
+    pd.testing.assert_frame_equal(rescores.reset_index(drop=True), scores.reset_index(drop=True), check_dtype=False)
+    # re-run with one new issue, last date not observed yet
+    write_forecast(str(tmp_path / "archive"), "2022_03_02_08", "daily", temp_min=1.0)
+    verif = new_verification(tmp_path)
+    new_scores = verif.score(DATE_SCORE)
+    assert len(verif.issues) == 2
+    daily = new_scores[(new_scores.forecast_type == "daily") & (new_scores.variable == "temp_min")]
+    assert list(daily['count']) == [2, 2, 1]
+    assert np.allclose(daily.bias, [0.5, 0.5, 1.0])
+
+def test_daily_not_midnight(tmp_path):
+    write_observations(str(tmp_path / "observations"))
+    # meteoConcept daily dates at 01:00
+    write_forecast(str(tmp_path / "archive"), "2022_03_01_08", "daily", temp_min=2.0, api="meteoConcept", hour=1)
+    scores = new_verification(tmp_path).score(DATE_SCORE)
+    daily = scores[scores.variable == "temp_min"]
+    assert list(daily.lead_time) == [0, 1, 2]
+    assert np.allclose(daily.bias, 1.0)
+
+def test_no_observations(tmp_path, capsys):
+    write_forecast(str(tmp_path / "archive"), "2022_03_01_08", "daily")
+    verif = new_verification(tmp_path)
+    assert verif.score(DATE_SCORE).empty
+    # files of stations without observations are not loaded
+    assert "No new forecast files" in capsys.readouterr().out
+    # scored once observations exist
+    write_observations(str(tmp_path / "observations"))
+    verif = new_verification(tmp_path)
+    assert not verif.score(DATE_SCORE).empty
+    assert len(verif.issues) == 1
+
+def test_observations_stopped(tmp_path, capsys):
+    write_observations(str(tmp_path / "observations"))
+    # last forecast date 2022-03-04 never observed
+    write_forecast(str(tmp_path / "archive"), "2022_03_02_08", "daily")
+    verif = new_verification(tmp_path)
+    verif.score(DATE_SCORE)
+    assert verif.issues.empty
+    # cached after observation delay
+    verif.score("2022-03-20")
+    verif.save_cache()
+    assert len(verif.issues) == 1
+    capsys.readouterr()
+    scores = new_verification(tmp_path).score("2022-03-21")
+    assert "No new forecast files" in capsys.readouterr().out
+    assert scores[scores.variable == "temp_min"]['count'].sum() == 2